@@ -9,6 +9,7 @@ import plotly.graph_objects as go
 import numpy as np
 from urllib.request import urlopen
 import json
+import os
 
 # Data pipeline to transform the csv.
 from data.make_dataset import (
@@ -20,13 +21,25 @@ from data.make_dataset import (
 )
 
 
+# Data sources. Override with environment variables to run against a local copy
+# (e.g. the synthetic fixture in data/make_fixture.py) without network access.
+DISTRICT_BOUNDARIES_URL = os.environ.get(
+    "DISTRICT_BOUNDARIES_URL",
+    'https://opendata.arcgis.com/datasets/62ec63afb8824a15953399b1fa819df2_0.geojson',
+)
+SHOOTINGS_CSV_URL = os.environ.get(
+    "SHOOTINGS_CSV_URL",
+    "https://phl.carto.com/api/v2/sql?q=SELECT+*,+ST_Y(the_geom)+AS+lat,+ST_X(the_geom)+AS+lng+FROM+shootings&filename=shootings&format=csv&skipfields=cartodb_id",
+)
+
+
 # GeoJSON file containing district boundaries.
-with urlopen('https://opendata.arcgis.com/datasets/62ec63afb8824a15953399b1fa819df2_0.geojson') as response:
+with urlopen(DISTRICT_BOUNDARIES_URL) as response:
     dist_boundaries = json.load(response)
 
 
 # Read the CSV data from the Carto database.
-df = pd.read_csv("https://phl.carto.com/api/v2/sql?q=SELECT+*,+ST_Y(the_geom)+AS+lat,+ST_X(the_geom)+AS+lng+FROM+shootings&filename=shootings&format=csv&skipfields=cartodb_id")
+df = pd.read_csv(SHOOTINGS_CSV_URL)
 
 # Apply the data pipeline to transform the CSV data.
 data = (
@@ -45,6 +58,26 @@ formatted_date = last_refreshed.strftime('%Y-%m-%d')
 years = data["year"].sort_values().unique().tolist()
 districts = data["dist"].sort_values().unique().tolist()
 
+# Optionally run update_charts as a background callback on a local disk-backed
+# job queue, coalescing identical in-flight requests (see callback_manager.py).
+# Requires `pip install "dash[diskcache]"`.
+USE_BACKGROUND_CALLBACKS = os.environ.get("BACKGROUND_CALLBACKS", "0") == "1"
+
+if USE_BACKGROUND_CALLBACKS:
+    import diskcache
+    from callback_manager import CoalescingDiskcacheManager
+
+    # Scope job results to this data load, so a restart with refreshed data
+    # never serves figures computed from the previous dataset.
+    data_version = f"{formatted_date}-{pd.util.hash_pandas_object(df, index=False).sum()}"
+
+    background_callback_manager = CoalescingDiskcacheManager(
+        diskcache.Cache(os.environ.get("CALLBACK_CACHE_DIR", "./cache")),
+        cache_by=[lambda: data_version],
+    )
+else:
+    background_callback_manager = None
+
 # Create a Dash app with external bootstrap stylesheet and meta tags.
 app = dash.Dash(
     __name__,
@@ -52,6 +85,7 @@ app = dash.Dash(
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1.0"}
     ],
+    background_callback_manager=background_callback_manager,
 )
 
 # Layout
@@ -229,7 +263,8 @@ app.layout = dbc.Container(body, fluid=True)
     Output("shootings_per_hour_bar_chart", "figure"),
     Output("choropleth_map", "figure"),
     Input("year_filter", "value"),
-    Input("police_district_filter", "value")
+    Input("police_district_filter", "value"),
+    background=USE_BACKGROUND_CALLBACKS,
 )
 
 # create function to update graphs based on year and police district
@@ -575,9 +610,6 @@ def update_charts(year_filter, police_district_filter):
     )
     
     
-    with urlopen('https://opendata.arcgis.com/datasets/62ec63afb8824a15953399b1fa819df2_0.geojson') as response:
-        dist_boundaries = json.load(response)
-        
     choropleth_map = px.choropleth_mapbox(
         data_frame=choropleth_map_data,
         geojson=dist_boundaries,
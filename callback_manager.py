@@ -0,0 +1,184 @@
+"""Background callback manager that coalesces identical in-flight jobs.
+
+Dash starts a new job for every background callback request, so when many
+users pick the same filters at once each of them computes the same figures.
+CoalescingDiskcacheManager runs at most one job per cache key (callback source
+plus inputs) and hands every request its own waiter handle on that key. The
+job is only killed, and its result only cleared, once the last waiter for the
+key has collected the result or been cancelled, so a user who changes the
+dropdown again cancels their own wait without cancelling anyone else's.
+
+Requires the diskcache extras: pip install "dash[diskcache]"
+"""
+import time
+import uuid
+
+from dash import DiskcacheManager
+
+# Seconds to keep a key's bookkeeping after its round started, for rounds
+# whose waiters never come back (e.g. a closed browser tab).
+WAITERS_EXPIRE = 60 * 60
+
+# Waiters that joined longer ago than this are treated as abandoned.
+WAITER_TIMEOUT = 5 * 60
+
+# Seconds after a job finishes during which new requests may still share its
+# result with waiters that have yet to collect it.
+FINISHED_GRACE = 10
+
+
+class CoalescingDiskcacheManager(DiskcacheManager):
+    """DiskcacheManager with single-flight jobs per cache key.
+
+    Job handles given to the browser are "<waiter id>:<cache key>" strings;
+    the PID of the key's current job is looked up when it is needed.
+    """
+
+    @staticmethod
+    def _job_key(key):
+        return f"{key}-job"
+
+    @staticmethod
+    def _waiters_key(key):
+        return f"{key}-waiters"
+
+    @staticmethod
+    def _finished_key(key):
+        return f"{key}-finished"
+
+    @staticmethod
+    def _is_pending(pid):
+        # Placeholder stored while the job process is being started.
+        return isinstance(pid, str)
+
+    def _set_waiters(self, key, waiters, expire_time):
+        """Stores the waiters without extending the round's expiry"""
+        expire = WAITERS_EXPIRE if expire_time is None else max(expire_time - time.time(), 1)
+        self.handle.set(self._waiters_key(key), waiters, expire=expire)
+
+    def make_job_fn(self, fn, progress, key=None):
+        job_fn = super().make_job_fn(fn, progress, key)
+        cache = self.handle
+        finished_key = self._finished_key
+
+        def coalesced_job_fn(result_key, progress_key, user_callback_args, context):
+            job_fn(result_key, progress_key, user_callback_args, context)
+            cache.set(finished_key(result_key), time.time(), expire=WAITERS_EXPIRE)
+
+        return coalesced_job_fn
+
+    def call_job_fn(self, key, job_fn, args, context):
+        waiter = uuid.uuid4().hex
+        placeholder = f"pending-{waiter}"
+        now = time.time()
+
+        with self.handle.transact():
+            waiters, expire_time = self.handle.get(self._waiters_key(key), {}, expire_time=True)
+            waiters = {w: joined for w, joined in waiters.items() if now - joined < WAITER_TIMEOUT}
+            pid = self.handle.get(self._job_key(key))
+            running = pid is not None and (self._is_pending(pid) or super().job_running(pid))
+            finished = self.handle.get(self._finished_key(key))
+            # Join the current round while its job is running, or shortly after
+            # it finished if other waiters have yet to collect the result.
+            recent = (
+                waiters and self.result_ready(key)
+                and finished is not None and now - finished < FINISHED_GRACE
+            )
+            start = not (running or recent)
+            if start:
+                # Never hand a new round an older round's result.
+                self.clear_cache_entry(key)
+                self.clear_cache_entry(self._finished_key(key))
+                self.handle.set(self._job_key(key), placeholder, expire=WAITERS_EXPIRE)
+                expire_time = None
+            waiters[waiter] = now
+            self._set_waiters(key, waiters, expire_time)
+
+        if start:
+            # Start the process outside the transaction so the fork does not
+            # hold the cache's write lock or inherit the open transaction.
+            try:
+                pid = super().call_job_fn(key, job_fn, args, context)
+            except Exception:
+                self._release(f"{waiter}:{key}")
+                raise
+
+            with self.handle.transact():
+                keep = self.handle.get(self._job_key(key)) == placeholder
+                if keep:
+                    self.handle.set(self._job_key(key), pid, expire=WAITERS_EXPIRE)
+            if not keep:
+                # Every waiter was cancelled while the process was starting.
+                super().terminate_job(pid)
+
+        return f"{waiter}:{key}"
+
+    def _release(self, job):
+        """Removes a waiter from its key.
+
+        Returns (True, pid) if it was the key's last waiter, after clearing the
+        key's result and bookkeeping, else (False, None).
+        """
+        waiter, key = str(job).split(":", 1)
+        with self.handle.transact():
+            waiters, expire_time = self.handle.get(self._waiters_key(key), expire_time=True)
+            if waiters is None or waiter not in waiters:
+                # Already released, e.g. collected its result then cancelled.
+                return False, None
+
+            del waiters[waiter]
+            if waiters:
+                self._set_waiters(key, waiters, expire_time)
+                return False, None
+
+            pid = self.handle.get(self._job_key(key))
+            for entry in (
+                key,
+                self._waiters_key(key),
+                self._job_key(key),
+                self._finished_key(key),
+                self._make_progress_key(key),
+            ):
+                self.clear_cache_entry(entry)
+            return True, pid
+
+    def _current_pid(self, job):
+        if ":" not in str(job):
+            return int(job)
+        return self.handle.get(self._job_key(str(job).split(":", 1)[1]))
+
+    def terminate_job(self, job):
+        if job is None:
+            return
+        if ":" not in str(job):
+            super().terminate_job(job)
+            return
+
+        last, pid = self._release(job)
+        if last and pid is not None and not self._is_pending(pid):
+            super().terminate_job(pid)
+
+    def terminate_unhealthy_job(self, job):
+        pid = self._current_pid(job)
+        if pid is None or self._is_pending(pid):
+            return False
+        return super().terminate_unhealthy_job(pid)
+
+    def job_running(self, job):
+        pid = self._current_pid(job)
+        if pid is None:
+            return False
+        return self._is_pending(pid) or super().job_running(pid)
+
+    def get_result(self, key, job):
+        result = self.handle.get(key, self.UNDEFINED)
+        if result is self.UNDEFINED:
+            return self.UNDEFINED
+
+        if job is None:
+            return super().get_result(key, job)
+
+        last, pid = self._release(job)
+        if last and pid is not None and not self._is_pending(pid):
+            super().terminate_job(pid)
+        return result
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+# Police districts present in the city's shootings data.
+DISTRICTS = [1, 2, 3, 5, 6, 7, 8, 9, 12, 14, 15, 16, 17, 18, 19, 22, 24, 25, 26, 35, 39, 77]
+
+CENTER_LAT, CENTER_LNG = 39.9526, -75.165222
+
+
+def make_shootings(n_rows=20000, first_year=2015, last_year=2023, seed=0):
+    """Builds a synthetic shootings table with the columns the pipeline expects"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(f"{first_year}-01-01", tz="UTC")
+    end = pd.Timestamp(f"{last_year}-12-31", tz="UTC")
+    days = rng.integers(0, (end - start).days + 1, n_rows)
+    dates = start + pd.to_timedelta(days, unit="D")
+    seconds = rng.integers(0, 24 * 60 * 60, n_rows)
+
+    dist = rng.choice(DISTRICTS, n_rows).astype(float)
+    # A small share of incidents have no district, as in the source data.
+    dist[rng.random(n_rows) < 0.002] = np.nan
+
+    return pd.DataFrame({
+        "objectid": np.arange(1, n_rows + 1),
+        "year": dates.year,
+        "date_": dates.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "time": pd.to_datetime(seconds, unit="s").strftime("%H:%M:%S"),
+        "race": rng.choice(["B", "W", "A"], n_rows, p=[0.8, 0.18, 0.02]),
+        "sex": rng.choice(["M", "F"], n_rows, p=[0.9, 0.1]),
+        "age": rng.integers(12, 80, n_rows),
+        "wound": rng.choice(["Head", "Chest", "Leg", "Arm", "Multiple"], n_rows),
+        "dist": dist,
+        "fatal": (rng.random(n_rows) < 0.2).astype(int),
+        "lat": CENTER_LAT + rng.normal(0, 0.05, n_rows),
+        "lng": CENTER_LNG + rng.normal(0, 0.05, n_rows),
+    })
+
+
+def make_dist_boundaries(size=0.02):
+    """Builds a GeoJSON grid of square police district boundaries"""
+    features = []
+    for i, district in enumerate(DISTRICTS):
+        lng = CENTER_LNG + (i % 5 - 2) * size
+        lat = CENTER_LAT + (i // 5 - 2) * size
+        ring = [[lng, lat], [lng + size, lat], [lng + size, lat + size], [lng, lat + size], [lng, lat]]
+        features.append({
+            "type": "Feature",
+            "properties": {"DISTRICT_": district},
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+def write_fixture(directory, **kwargs):
+    """Writes the synthetic CSV and GeoJSON to `directory`.
+
+    Returns a dict of environment variables pointing app.py at the fixture.
+    """
+    directory = Path(directory).resolve()
+    directory.mkdir(parents=True, exist_ok=True)
+    csv_path = directory / "shootings.csv"
+    geojson_path = directory / "dist_boundaries.geojson"
+
+    make_shootings(**kwargs).to_csv(csv_path, index=False)
+    with open(geojson_path, "w") as f:
+        json.dump(make_dist_boundaries(), f)
+
+    return {
+        "SHOOTINGS_CSV_URL": str(csv_path),
+        "DISTRICT_BOUNDARIES_URL": geojson_path.as_uri(),
+    }
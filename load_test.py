@@ -0,0 +1,369 @@
+"""Concurrent-user load test for the dashboard.
+
+Starts app.py against the synthetic fixture in data/make_fixture.py (no network
+access needed), replays sequences of dropdown changes from many virtual users
+posting to /_dash-update-component, and reports throughput and p50/p95/p99
+latency for each server worker count. Workers are persistent, pre-forked
+server processes that each handle one request at a time.
+
+    python load_test.py --workers 1 2 4 --users 20 --duration 30 --output results.json
+    python load_test.py --workers 1 2 4 --baseline results.json
+
+Results are written as JSON so runs before and after a change to update_charts
+can be compared with --baseline; the baseline must have been run with the
+same settings (users, duration, rows, ...).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+import numpy as np
+
+from data.make_fixture import write_fixture
+
+HOST = "127.0.0.1"
+
+CHART_IDS = [
+    "shootings_per_year_bar_chart",
+    "shootings_per_month_bar_chart",
+    "shootings_heatmap",
+    "shootings_per_hour_bar_chart",
+    "choropleth_map",
+]
+
+
+# Server
+# ==================================
+
+def serve(port, workers):
+    """Runs the app on a pre-forked pool of `workers` server processes.
+
+    The parent binds the socket and warms update_charts up once, then forks
+    persistent workers that each accept on the shared socket and serve one
+    request at a time, like `gunicorn -w N`. Requires a fork-capable OS.
+    """
+    import app as dashboard
+    from werkzeug.serving import make_server
+
+    # Keep per-request access logs out of the report; errors are still shown.
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    # Import plotly/pandas code paths before forking so workers start warm.
+    dashboard.update_charts("All Years", "All Districts")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((HOST, port))
+    sock.listen(128)
+
+    def run_worker():
+        server = make_server(HOST, port, dashboard.app.server, threaded=False, processes=1, fd=sock.fileno())
+        server.serve_forever()
+
+    # Exit through SystemExit so multiprocessing terminates the daemon workers.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    context = multiprocessing.get_context("fork")
+    pool = [context.Process(target=run_worker, daemon=True) for _ in range(workers)]
+    for proc in pool:
+        proc.start()
+    for proc in pool:
+        proc.join()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, env, timeout=120):
+    """Starts the app in a subprocess and waits until it accepts requests"""
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--port", str(port), "--workers", str(workers)],
+        env={**os.environ, **env},
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            status, _ = asyncio.run(request(port, "GET", "/_dash-layout"))
+            if status == 200:
+                return proc, port
+        except OSError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"Server did not start within {timeout}s")
+
+
+# HTTP client
+# ==================================
+
+async def request(port, method, path, body=None):
+    """Minimal asyncio HTTP/1.1 client; returns (status, body bytes)"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    payload = b"" if body is None else json.dumps(body).encode()
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: {HOST}:{port}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    try:
+        writer.write(head.encode() + payload)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    header, _, content = response.partition(b"\r\n\r\n")
+    status = int(header.split(b" ", 2)[1])
+    return status, content
+
+
+def update_payload(year_filter, police_district_filter, changed):
+    """Body of the request Dash sends when a dropdown changes"""
+    return {
+        "output": ".." + "...".join(f"{i}.figure" for i in CHART_IDS) + "..",
+        "outputs": [{"id": i, "property": "figure"} for i in CHART_IDS],
+        "inputs": [
+            {"id": "year_filter", "property": "value", "value": year_filter},
+            {"id": "police_district_filter", "property": "value", "value": police_district_filter},
+        ],
+        "changedPropIds": [f"{i}.value" for i in changed],
+        "state": [],
+    }
+
+
+async def update_charts(port, year_filter, police_district_filter, changed, poll_interval):
+    """Runs the update_charts callback; returns the final HTTP status.
+
+    When the app runs it as a background callback, the first response only
+    carries the job handles, so keep polling like the Dash renderer does.
+    """
+    body = update_payload(year_filter, police_district_filter, changed)
+    path = "/_dash-update-component"
+    while True:
+        status, content = await request(port, "POST", path, body)
+        if status != 200:
+            return status
+        response = json.loads(content)
+        if "response" in response:
+            return status
+        if "cacheKey" in response:
+            path = f"/_dash-update-component?{urlencode({'cacheKey': response['cacheKey'], 'job': response['job']})}"
+        await asyncio.sleep(poll_interval)
+
+
+def dropdown_options(layout):
+    """Collects the option values of every dropdown in a serialized layout"""
+    options = {}
+    stack = [layout]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            props = node.get("props", {})
+            if node.get("type") == "Dropdown":
+                options[props["id"]] = [o["value"] for o in props["options"]]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return options
+
+
+# Virtual users
+# ==================================
+
+async def virtual_user(port, options, deadline, think_time, poll_interval, timeout, rng, latencies, errors):
+    """Replays sessions of dropdown changes until the deadline.
+
+    Each session starts with the initial page load callback and then changes
+    one of the two filters a few times, pausing between changes. Requests
+    taking longer than `timeout` seconds count as errors.
+    """
+    while time.monotonic() < deadline:
+        year, district = "All Years", "All Districts"
+        steps = [((year, district), [])]
+        for _ in range(rng.randint(3, 8)):
+            if rng.random() < 0.5:
+                year = rng.choice(options["year_filter"])
+                steps.append(((year, district), ["year_filter"]))
+            else:
+                district = rng.choice(options["police_district_filter"])
+                steps.append(((year, district), ["police_district_filter"]))
+
+        for (year, district), changed in steps:
+            if time.monotonic() >= deadline:
+                return
+            start = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(
+                    update_charts(port, year, district, changed, poll_interval), timeout
+                )
+                ok = status in (200, 204)
+            except (OSError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(time.perf_counter() - start)
+            await asyncio.sleep(rng.uniform(0, think_time))
+
+
+async def run_users(port, users, duration, think_time, poll_interval, timeout, seed):
+    _, layout = await request(port, "GET", "/_dash-layout")
+    options = dropdown_options(json.loads(layout))
+
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        virtual_user(port, options, deadline, think_time, poll_interval, timeout, random.Random(seed + i), latencies, errors)
+        for i in range(users)
+    ])
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def summarize(workers, latencies, errors, elapsed):
+    ms = np.array(latencies) * 1000
+    # None rather than NaN when nothing succeeded, so the results stay valid JSON.
+    p50, p95, p99 = (round(float(p), 1) for p in np.percentile(ms, [50, 95, 99])) if len(ms) else (None,) * 3
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+# Reporting
+# ==================================
+
+COLUMNS = ["workers", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+
+# Settings saved with each run; a baseline is only comparable if they match.
+CONFIG_KEYS = ["users", "duration", "think_time", "background", "poll_interval", "timeout", "rows", "seed"]
+
+
+def config_mismatches(config, baseline):
+    """Names of settings that differ between this run and the baseline"""
+    saved = baseline.get("config", {})
+    return [k for k in CONFIG_KEYS if saved.get(k) != config[k]]
+
+
+def print_results(results, baseline=None):
+    previous = {r["workers"]: r for r in baseline["results"]} if baseline else {}
+    print("  ".join(f"{c:>16}" for c in COLUMNS))
+    for row in results:
+        cells = []
+        for c in COLUMNS:
+            cell = f"{row[c]}"
+            old = previous.get(row["workers"], {}).get(c)
+            if old and row[c] is not None and c not in ("workers", "requests", "errors"):
+                cell += f" ({(row[c] - old) / old:+.0%})"
+            cells.append(f"{cell:>16}")
+        print("  ".join(cells))
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command")
+    serve_parser = sub.add_parser("serve", help="run the app (used internally)")
+    serve_parser.add_argument("--port", type=int, required=True)
+    serve_parser.add_argument("--workers", type=int, default=1)
+
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="pre-forked server worker counts to test")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load per worker count")
+    parser.add_argument("--think-time", type=float, default=1.0, help="max pause between dropdown changes (s)")
+    parser.add_argument("--background", action="store_true", help="run update_charts as a background callback")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="background job polling interval (s)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds before a request counts as an error")
+    parser.add_argument("--rows", type=int, default=20000, help="rows in the synthetic fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--label", default=None, help="name for this run in the results file")
+    parser.add_argument("--output", default=None, help="write results JSON to this path")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.port, args.workers)
+        return
+
+    config = {k: getattr(args, k) for k in CONFIG_KEYS}
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatched = config_mismatches(config, baseline)
+        if mismatched:
+            parser.error(
+                f"{args.baseline} was run with different settings, so results are not comparable: "
+                + ", ".join(f"{k} ({baseline.get('config', {}).get(k)} vs {config[k]})" for k in mismatched)
+            )
+
+    results = []
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        env = write_fixture(fixture_dir, n_rows=args.rows, seed=args.seed)
+        if args.background:
+            env["BACKGROUND_CALLBACKS"] = "1"
+            env["CALLBACK_CACHE_DIR"] = os.path.join(fixture_dir, "cache")
+        for workers in args.workers:
+            proc, port = start_server(workers, env)
+            try:
+                latencies, errors, elapsed = asyncio.run(
+                    run_users(port, args.users, args.duration, args.think_time, args.poll_interval, args.timeout, args.seed)
+                )
+            finally:
+                proc.terminate()
+                proc.wait()
+            results.append(summarize(workers, latencies, errors, elapsed))
+
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            "label": args.label,
+            "git_commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": config,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
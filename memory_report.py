@@ -0,0 +1,236 @@
+"""Memory footprint report for the loaded dataset and figures.
+
+Loads the data through the data.make_dataset pipeline (by importing app.py)
+and reports:
+
+- deep memory usage per column of `data`
+- the size of `dist_boundaries`
+- the serialized size of each figure update_charts returns for representative filters
+- peak RSS across the import of app.py
+
+By default the app runs against the synthetic fixture in data/make_fixture.py,
+so no network access is needed. With --check the report is compared against
+BUDGETS and the script exits with status 1 if anything is over budget;
+tests/test_memory_report.py asserts the same budgets, so a memory blow-up is
+caught before it reaches production.
+
+    python memory_report.py
+    python memory_report.py --check
+    python memory_report.py --live --output memory.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from data.make_fixture import write_fixture
+
+# Budgets (bytes) for the synthetic fixture at its default size, about twice
+# the measured values. Override with --budgets path/to/budgets.json.
+BUDGETS = {
+    "data_total": 16 * 1024 ** 2,
+    "data_column": 2 * 1024 ** 2,
+    "dist_boundaries": 64 * 1024,
+    "figure": 32 * 1024,
+    "peak_rss": 256 * 1024 ** 2,
+}
+
+FIXTURE_ROWS = 20000
+
+FIGURE_NAMES = [
+    "shootings_per_year_bar_chart",
+    "shootings_per_month_bar_chart",
+    "shootings_heatmap",
+    "shootings_per_hour_bar_chart",
+    "choropleth_map",
+]
+
+# Run in a fresh interpreter so the numbers cover the import of app.py alone.
+RSS_SCRIPT = """
+import json, sys
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def peak_rss():
+    # VmHWM is reset on exec; ru_maxrss on Linux keeps the parent's peak.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+        return rss if sys.platform == "darwin" else rss * 1024
+    import psutil
+    return psutil.Process().memory_info().peak_wset
+
+before = peak_rss()
+import app
+print(json.dumps({"before_import": before, "peak": peak_rss()}))
+"""
+
+
+def deep_getsizeof(obj, seen=None):
+    """Approximate in-memory size of nested containers such as parsed JSON"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_getsizeof(k, seen) + deep_getsizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_getsizeof(i, seen) for i in obj)
+    return size
+
+
+def representative_filters(years, districts):
+    """Filter combinations covering each branch of update_charts"""
+    return [
+        ("All Years", "All Districts"),
+        (years[-1], "All Districts"),
+        ("All Years", districts[0]),
+        (years[-1], districts[0]),
+    ]
+
+
+def measure_app():
+    """Measures the data and figures of app.py as imported in this process"""
+    import app
+
+    columns = app.data.memory_usage(deep=True)
+    figures = []
+    for year_filter, police_district_filter in representative_filters(app.years, app.districts):
+        charts = app.update_charts(year_filter, police_district_filter)
+        figures.append({
+            "year_filter": year_filter,
+            "police_district_filter": police_district_filter,
+            "sizes": {name: len(fig.to_json().encode()) for name, fig in zip(FIGURE_NAMES, charts)},
+        })
+
+    return {
+        "rows": len(app.data),
+        "data_columns": {str(col): int(size) for col, size in columns.items()},
+        "data_total": int(columns.sum()),
+        "dist_boundaries": {
+            "features": len(app.dist_boundaries["features"]),
+            "serialized": len(json.dumps(app.dist_boundaries).encode()),
+            "in_memory": deep_getsizeof(app.dist_boundaries),
+        },
+        "figures": figures,
+    }
+
+
+def run_script(script, env):
+    """Runs `script` in a fresh interpreter with `env`; returns its last line as JSON"""
+    out = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, **env},
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def build_report(env):
+    """Report for app.py loaded with `env`.
+
+    Both measurements run in fresh interpreters, so the caller's environment
+    and modules are left untouched and the right dataset is always measured.
+    """
+    report = run_script("import json, memory_report; print(json.dumps(memory_report.measure_app()))", env)
+    report["import_rss"] = run_script(RSS_SCRIPT, env)
+    return report
+
+
+def check_budgets(report, budgets=BUDGETS):
+    """Returns a list of messages for every measurement over budget"""
+    failures = []
+
+    def check(name, value, budget):
+        if value > budget:
+            failures.append(f"{name}: {fmt_size(value)} > budget {fmt_size(budget)}")
+
+    check("data total", report["data_total"], budgets["data_total"])
+    for col, size in report["data_columns"].items():
+        check(f"data column '{col}'", size, budgets["data_column"])
+    check("dist_boundaries", report["dist_boundaries"]["in_memory"], budgets["dist_boundaries"])
+    for entry in report["figures"]:
+        for name, size in entry["sizes"].items():
+            check(f"{name} ({entry['year_filter']}, {entry['police_district_filter']})", size, budgets["figure"])
+    check("peak RSS across import of app.py", report["import_rss"]["peak"], budgets["peak_rss"])
+    return failures
+
+
+def fmt_size(n):
+    if n < 1024 ** 2:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / 1024 ** 2:.2f} MB"
+
+
+def print_report(report):
+    print(f"data: {report['rows']:,} rows, {fmt_size(report['data_total'])}")
+    for col, size in sorted(report["data_columns"].items(), key=lambda item: -item[1]):
+        print(f"  {col:<24}{fmt_size(size):>12}")
+
+    boundaries = report["dist_boundaries"]
+    print(f"\ndist_boundaries: {boundaries['features']} features, "
+          f"{fmt_size(boundaries['in_memory'])} in memory, {fmt_size(boundaries['serialized'])} serialized")
+
+    print("\nserialized figures:")
+    for entry in report["figures"]:
+        print(f"  {entry['year_filter']} / {entry['police_district_filter']}")
+        for name, size in entry["sizes"].items():
+            print(f"    {name:<32}{fmt_size(size):>12}")
+
+    rss = report["import_rss"]
+    print(f"\npeak RSS: {fmt_size(rss['before_import'])} before import of app.py, {fmt_size(rss['peak'])} after")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--live", action="store_true", help="load the live data sources instead of the fixture")
+    parser.add_argument("--rows", type=int, default=FIXTURE_ROWS, help="rows in the synthetic fixture")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if over BUDGETS")
+    parser.add_argument("--budgets", default=None, help="JSON file overriding entries of BUDGETS")
+    parser.add_argument("--output", default=None, help="write the report JSON to this path")
+    args = parser.parse_args(argv)
+    if args.check and args.live:
+        parser.error("budgets are set for the synthetic fixture; --check cannot be used with --live")
+    if args.check and args.rows != FIXTURE_ROWS:
+        parser.error(f"budgets are set for the {FIXTURE_ROWS:,}-row fixture; --check cannot be used with --rows")
+
+    budgets = dict(BUDGETS)
+    if args.budgets:
+        with open(args.budgets) as f:
+            budgets.update(json.load(f))
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        env = {} if args.live else write_fixture(fixture_dir, n_rows=args.rows)
+        report = build_report(env)
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.check:
+        failures = check_budgets(report, budgets)
+        if failures:
+            print("\nOver budget:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\nAll measurements within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+diskcache = pytest.importorskip("diskcache")
+pytest.importorskip("psutil")
+pytest.importorskip("multiprocess")
+
+import callback_manager  # noqa: E402
+from callback_manager import CoalescingDiskcacheManager  # noqa: E402
+from dash import DiskcacheManager  # noqa: E402
+
+KEY = "key"
+
+
+def double(x):
+    time.sleep(1)
+    return x * 2
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """PIDs of every job process the manager starts"""
+    pids = []
+    call_job_fn = DiskcacheManager.call_job_fn
+
+    def counting_call_job_fn(self, *args, **kwargs):
+        pid = call_job_fn(self, *args, **kwargs)
+        pids.append(pid)
+        return pid
+
+    monkeypatch.setattr(DiskcacheManager, "call_job_fn", counting_call_job_fn)
+    return pids
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CoalescingDiskcacheManager(diskcache.Cache(str(tmp_path)))
+
+
+def start(manager):
+    return manager.call_job_fn(KEY, manager.make_job_fn(double, False), [21], {})
+
+
+def wait_for_result(manager, job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = manager.get_result(KEY, job)
+        if result is not manager.UNDEFINED:
+            return result
+        time.sleep(0.05)
+    raise AssertionError("job did not finish")
+
+
+def wait_until_stopped(manager, pid, timeout=5):
+    deadline = time.monotonic() + timeout
+    while manager.job_running(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return not manager.job_running(pid)
+
+
+def assert_cleaned_up(manager):
+    for entry in (KEY, f"{KEY}-job", f"{KEY}-waiters", f"{KEY}-finished"):
+        assert manager.handle.get(entry) is None
+
+
+def test_identical_requests_share_one_job(manager, started):
+    first, second = start(manager), start(manager)
+
+    assert len(started) == 1
+    assert wait_for_result(manager, first) == 42
+    assert manager.get_result(KEY, second) == 42
+
+
+def test_cancelling_one_waiter_keeps_the_job_for_others(manager, started):
+    cancelled, waiting = start(manager), start(manager)
+
+    manager.terminate_job(cancelled)
+
+    assert manager.job_running(waiting)
+    assert wait_for_result(manager, waiting) == 42
+
+
+def test_cancelling_every_waiter_kills_the_job(manager, started):
+    jobs = [start(manager), start(manager)]
+
+    for job in jobs:
+        manager.terminate_job(job)
+
+    assert wait_until_stopped(manager, started[0])
+    time.sleep(1.5)
+    assert not manager.result_ready(KEY)
+    assert_cleaned_up(manager)
+
+
+def test_last_waiter_clears_result_and_bookkeeping(manager, started):
+    first, second = start(manager), start(manager)
+
+    assert wait_for_result(manager, first) == 42
+    assert manager.result_ready(KEY)
+    assert manager.get_result(KEY, second) == 42
+    # Releasing an already collected handle again is a no-op.
+    manager.terminate_job(first)
+    assert_cleaned_up(manager)
+
+
+def test_abandoned_waiter_does_not_serve_stale_results(manager, started, monkeypatch):
+    monkeypatch.setattr(callback_manager, "FINISHED_GRACE", 0.5)
+    monkeypatch.setattr(callback_manager, "WAITER_TIMEOUT", 2)
+    collected, abandoned = start(manager), start(manager)
+    assert wait_for_result(manager, collected) == 42
+
+    # Past the grace window a new request must not reuse the old result.
+    time.sleep(1)
+    fresh = start(manager)
+    assert len(started) == 2
+    assert manager.get_result(KEY, fresh) is manager.UNDEFINED
+
+    # Once the abandoned waiter times out it no longer holds the key open.
+    assert wait_for_result(manager, fresh) == 42
+    time.sleep(2)
+    last = start(manager)
+    assert wait_for_result(manager, last) == 42
+    assert_cleaned_up(manager)
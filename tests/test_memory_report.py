@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+from data.make_fixture import write_fixture
+from memory_report import BUDGETS, FIXTURE_ROWS, build_report, check_budgets
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Measure the default configuration whatever the caller's shell sets.
+        monkeypatch.delenv("BACKGROUND_CALLBACKS", raising=False)
+        yield build_report(write_fixture(tmp_path_factory.mktemp("fixture"), n_rows=FIXTURE_ROWS))
+
+
+def test_fixture_within_budgets(report):
+    assert check_budgets(report) == []
+
+
+def test_over_budget_is_reported(report):
+    failures = check_budgets(report, {**BUDGETS, "figure": 1})
+    assert failures
+    assert all("budget" in failure for failure in failures)
+
+
+def test_report_leaves_process_state_alone(report):
+    assert "app" not in sys.modules
+    assert "SHOOTINGS_CSV_URL" not in os.environ
+    assert "DISTRICT_BOUNDARIES_URL" not in os.environ